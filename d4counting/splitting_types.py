@@ -1,20 +1,100 @@
-from dataclasses import dataclass
-from typing import List, FrozenSet, Tuple
+import functools
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, List, FrozenSet, Iterator, Sequence, Set, Tuple
 
-from sympy.combinatorics import Permutation
 
+Coset = Tuple[int, ...]
+SetOfCosets = FrozenSet[Coset]
 
-SetOfCosets = FrozenSet[FrozenSet[Permutation]]
+
+class Perm4(int):
+    """
+    A permutation of {0, 1, 2, 3} packed into a single byte: the image of i is stored
+    in bits 2i and 2i + 1. Products use the same (left-to-right) convention as sympy,
+    i.e., (a * b)(i) = b(a(i)), and are looked up in the Cayley table `MUL`.
+
+    Example:
+        >>> σ = Perm4.from_cycles((0, 1, 2, 3))
+        >>> τ = Perm4.from_cycles((0, 1), (2, 3))
+        >>> σ * τ
+        Perm4.from_images((0, 3, 2, 1))
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_images(cls, images: Sequence[int]) -> "Perm4":
+        """ Build the permutation sending i to images[i] """
+        return cls(images[0] | images[1] << 2 | images[2] << 4 | images[3] << 6)
+
+    @classmethod
+    def from_cycles(cls, *cycles: Tuple[int, ...]) -> "Perm4":
+        """ Build the permutation given by a product of disjoint cycles """
+        images = list(range(4))
+        for cycle in cycles:
+            for i, j in zip(cycle, cycle[1:] + cycle[:1]):
+                images[i] = j
+        return cls.from_images(images)
+
+    @property
+    def images(self) -> Tuple[int, ...]:
+        """ The images of 0, 1, 2, 3 under this permutation """
+        return tuple((self >> (2 * i)) & 3 for i in range(4))
+
+    def __mul__(self, other: "Perm4") -> "Perm4":  # type: ignore[override]
+        return MUL[self][other]
+
+    def __pow__(self, exponent: int) -> "Perm4":  # type: ignore[override]
+        # The order of every element of S4 divides 12, so this also handles negative
+        # exponents: g ** -1 is g ** 11, the inverse of g
+        exponent %= 12
+        result = IDENTITY
+        for _ in range(exponent):
+            result = result * self
+        return result
+
+    def __repr__(self) -> str:
+        return f"Perm4.from_images({self.images})"
+
+
+IDENTITY = Perm4.from_images((0, 1, 2, 3))
+
+_S4 = [Perm4.from_images(images) for images in itertools.permutations(range(4))]
+
+# The Cayley table of S4: MUL[a][b] is a * b. Every product is built once here, so
+# multiplying never allocates a new Perm4
+MUL: Dict[int, Dict[int, Perm4]] = {
+    a: {b: Perm4.from_images([b.images[i] for i in a.images]) for b in _S4} for a in _S4
+}
+
+# The transpose of MUL: _RIGHT_MUL[g][h] is h * g
+_RIGHT_MUL: Dict[int, Dict[int, Perm4]] = {g: {h: MUL[h][g] for h in _S4} for g in _S4}
+
+
+def _translate(coset: Coset, g: int) -> Coset:
+    """ Right multiply every element of `coset` by `g`, returning a sorted tuple """
+    return tuple(sorted(map(_RIGHT_MUL[g].__getitem__, coset)))
 
 
 @dataclass(eq=True, frozen=True)
 class GaloisGroup:
     """ A simple representation of a group that also includes a name for printing purposes """
 
-    group: Tuple[Permutation]
+    group: Tuple[Perm4, ...]
     latex_name: str
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Groups are dictionary keys in the splitting computation, so freeze the
+        # elements into a tuple and hash them once
+        object.__setattr__(self, "group", tuple(self.group))
+        object.__setattr__(self, "_hash", hash((self.group, self.latex_name)))
+
+    def __hash__(self) -> int:
+        return self._hash
 
-    def __iter__(self):
+    def __iter__(self) -> Iterator[Perm4]:
         return iter(self.group)
 
 
@@ -28,9 +108,10 @@ def get_cosets(big_galois: GaloisGroup, small_galois: GaloisGroup) -> SetOfCoset
         small_galois: The acting subgroup of big_galois
 
     Returns:
-        A colletion of cosets. Each coset is a frozenset of `Permutation`s.
+        A colletion of cosets. Each coset is a sorted tuple of encoded permutations.
     """
-    return frozenset(frozenset(h * g for h in small_galois) for g in big_galois)
+    small = tuple(small_galois)
+    return frozenset(_translate(small, g) for g in big_galois)
 
 
 def get_orbits(cosets: SetOfCosets, group: GaloisGroup) -> FrozenSet[SetOfCosets]:
@@ -45,11 +126,23 @@ def get_orbits(cosets: SetOfCosets, group: GaloisGroup) -> FrozenSet[SetOfCosets
 
     Returns:
         A collection of collections of cosets. Each collection represents an orbit.
-        Each coset is represented as frozenset.
+        Each coset is represented as a sorted tuple.
     """
-    return frozenset(
-        frozenset(frozenset(h * g for h in coset) for g in group) for coset in cosets
-    )
+    return frozenset(_iter_orbits(cosets, group))
+
+
+def _iter_orbits(cosets: SetOfCosets, group: GaloisGroup) -> Iterator[SetOfCosets]:
+    """
+    Yield each orbit of `group` acting on `cosets` exactly once. A coset already seen
+    in some orbit is skipped, so every orbit is only built a single time.
+    """
+    seen: Set[Coset] = set()
+    for coset in cosets:
+        if coset in seen:
+            continue
+        orbit = frozenset(_translate(coset, g) for g in group)
+        seen.update(orbit)
+        yield orbit
 
 
 def compute_inertia(
@@ -68,15 +161,28 @@ def compute_inertia(
             * f is the inertia degree of the associated prime and
             * e is the ramification index
     """
-    inertia = []
-    for orbit in decomp_orbits:
-        suborbits = get_orbits(orbit, inertia_group)
-        example_orbit = next(iter(suborbits))
-        inertia.append((len(suborbits), len(example_orbit)))
-    return inertia
+    return [inertia_of_orbit(orbit, inertia_group) for orbit in decomp_orbits]
 
 
-def write_inertia(inertia: List[Tuple[int, int]]):
+def inertia_of_orbit(orbit: SetOfCosets, inertia_group: GaloisGroup) -> Tuple[int, int]:
+    """
+    Split an orbit of the decomposition group into orbits of `inertia_group` and
+    return their number and size. This is the same as taking `get_orbits(orbit,
+    inertia_group)` and measuring it, but without building the collection of orbits.
+
+    Args:
+        orbit: An orbit of the decomposition group, as returned by `get_orbits`
+        inertia_group: The inertia group to examine
+
+    Returns:
+        The pair (f, e) of the number of suborbits and the size of a suborbit
+    """
+    suborbits = _iter_orbits(orbit, inertia_group)
+    suborbit_size = len(next(suborbits))
+    return 1 + sum(1 for _ in suborbits), suborbit_size
+
+
+def write_inertia(inertia: List[Tuple[int, int]]) -> str:
     """
     Given an inertia decomposition as returned by `compute_inertia`, create the string
     version that is latex displayable.
@@ -88,58 +194,72 @@ def write_inertia(inertia: List[Tuple[int, int]]):
     Args:
         inertia: The inertia representation as returned by `compute_inertia`
     """
-    inertia.sort(key=lambda x: (x[0], -x[1]))
+    # Sort a copy so the caller's list (and any cached decomposition) is untouched
+    inertia = sorted(inertia, key=lambda x: (x[0], -x[1]))
     elts = [f"{f}^{e}" if e > 1 else f"{f}" for f, e in inertia]
     return "(" + " ".join(elts) + ")"
 
 
-def main():
-    σ = Permutation(0, 1, 2, 3)
-    τ = Permutation(0, 1)(2, 3)
-    ι = Permutation(3)  # The identity
+@functools.lru_cache(maxsize=None)
+def splitting_table() -> Tuple[Tuple[str, str, Tuple[str, ...]], ...]:
+    """
+    Compute the body of Table 1: the splitting types of the subfields of a D4 field
+    for each pair of inertia and decomposition groups. The table only depends on
+    the fixed subgroup lattice of D4, so it is computed once and then cached.
+
+    Returns:
+        One row per (inertia group, decomposition group) pair. Each row is a triple of
+        the latex names of the two groups and the latex splitting type (as returned by
+        `write_inertia`) of each subfield M, L_1, K_1, L_2, K_2, L, K, in that order.
+    """
+    σ = Perm4.from_cycles((0, 1, 2, 3))
+    τ = Perm4.from_cycles((0, 1), (2, 3))
+    ι = IDENTITY
+
+    # Every element of D4 is built from these products, so compute each of them once
+    σ2 = σ * σ
+    σ3 = σ2 * σ
+    στ, σ2τ, σ3τ = σ * τ, σ2 * τ, σ3 * τ
 
     # Make sure these are actually generators of D4
-    assert τ ** 2 == ι
-    assert σ ** 4 == ι
-    assert τ * σ * τ == σ ** 3
+    assert τ * τ == ι
+    assert σ2 * σ2 == ι
+    assert τ * σ * τ == σ3
 
     # The big group
-    D4 = GaloisGroup(
-        group=(ι, σ, σ ** 2, σ ** 3, τ, σ * τ, σ ** 2 * τ, σ ** 3 * τ),
-        latex_name=r"D_4",
-    )
+    D4 = GaloisGroup(group=(ι, σ, σ2, σ3, τ, στ, σ2τ, σ3τ), latex_name=r"D_4")
 
     # The individual Galois groups corresponding to the field diagram in the paper
     Gal_M_M = GaloisGroup(group=(ι,), latex_name=r"\{1\}")
+
     Gal_M_L1 = GaloisGroup(group=(ι, τ), latex_name=r"\langle \tau \rangle")
-    Gal_M_L1_prime = GaloisGroup(
-        group=(ι, σ ** 2 * τ), latex_name=r"\langle \sigma^2 \tau \rangle"
-    )
-    Gal_M_L2 = GaloisGroup(group=(ι, σ * τ), latex_name=r"\langle \sigma \tau \rangle")
-    Gal_M_L2_prime = GaloisGroup(
-        group=(ι, σ ** 3 * τ), latex_name=r"\langle \sigma^3 \tau \rangle"
-    )
-    Gal_M_L = GaloisGroup(group=(ι, σ ** 2), latex_name=r"\langle \sigma^2 \rangle")
+    # Conjugate of Gal_M_L1, so unused in computation
+    # Gal_M_L1_prime = GaloisGroup(
+    #     group=(ι, σ2τ), latex_name=r"\langle \sigma^2 \tau \rangle"
+    # )
+
+    Gal_M_L2 = GaloisGroup(group=(ι, στ), latex_name=r"\langle \sigma \tau \rangle")
+    # Conjugate of Gal_M_L2, so unused in computation
+    # Gal_M_L2_prime = GaloisGroup(
+    #     group=(ι, σ3τ), latex_name=r"\langle \sigma^3 \tau \rangle"
+    # )
+
+    Gal_M_L = GaloisGroup(group=(ι, σ2), latex_name=r"\langle \sigma^2 \rangle")
     Gal_M_K1 = GaloisGroup(
-        group=(ι, τ, σ ** 2, σ ** 2 * τ), latex_name=r"\langle \tau, \sigma^2 \rangle"
+        group=(ι, τ, σ2, σ2τ), latex_name=r"\langle \tau, \sigma^2 \rangle"
     )
     Gal_M_K2 = GaloisGroup(
-        group=(ι, σ * τ, σ ** 2, σ ** 3 * τ),
-        latex_name=r"\langle \sigma \tau, \sigma^2 \rangle",
-    )
-    Gal_M_K = GaloisGroup(
-        group=(ι, σ, σ ** 2, σ ** 3), latex_name=r"\langle \sigma \rangle"
+        group=(ι, στ, σ2, σ3τ), latex_name=r"\langle \sigma \tau, \sigma^2 \rangle"
     )
+    Gal_M_K = GaloisGroup(group=(ι, σ, σ2, σ3), latex_name=r"\langle \sigma \rangle")
 
     gal_groups = [
         Gal_M_M,
         Gal_M_L1,
-        Gal_M_L1_prime,
-        Gal_M_L2,
-        Gal_M_L2_prime,
-        Gal_M_L,
         Gal_M_K1,
+        Gal_M_L2,
         Gal_M_K2,
+        Gal_M_L,
         Gal_M_K,
     ]
 
@@ -192,3 +312,26 @@ def main():
         Gal_M_K2,
         D4,
     ]
+
+    # Cosets only depend on the column and orbits only on the (column, D_p) pair, so
+    # compute each of them once rather than once per cell
+    coset_cache = {
+        galois_group: get_cosets(D4, galois_group) for galois_group in gal_groups
+    }
+    orbit_cache = {}
+
+    table = []
+    for inertia_group, decomposition_group in zip(inertia_groups, decomposition_groups):
+        cells = []
+        for galois_group in gal_groups:
+            key = (galois_group, decomposition_group)
+            if key not in orbit_cache:
+                orbit_cache[key] = get_orbits(
+                    coset_cache[galois_group], decomposition_group
+                )
+            inertia = compute_inertia(orbit_cache[key], inertia_group)
+            cells.append(write_inertia(inertia))
+        table.append(
+            (inertia_group.latex_name, decomposition_group.latex_name, tuple(cells))
+        )
+    return tuple(table)
@@ -0,0 +1,26 @@
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from d4counting.cli import cli
+
+
+SNAPSHOTS = Path(__file__).parent / "snapshots"
+
+
+def test_expectation_command():
+    """
+    The expectation command should print exactly the known-good Table 2
+    """
+    result = CliRunner().invoke(cli, ["expectation"])
+    assert result.exit_code == 0
+    assert result.output == (SNAPSHOTS / "expectation.txt").read_text()
+
+
+def test_splitting_command():
+    """
+    The splitting command should print exactly the known-good Table 1
+    """
+    result = CliRunner().invoke(cli, ["splitting"])
+    assert result.exit_code == 0
+    assert result.output == (SNAPSHOTS / "splitting.txt").read_text()
@@ -0,0 +1,67 @@
+from fractions import Fraction
+
+from d4counting import expected_number
+
+
+def test_fields():
+    """
+    Spot check the databases
+    """
+    assert len(expected_number.make_c2_fields()) == 7
+    assert len(expected_number.make_c4_fields()) == 12
+    assert len(expected_number.make_v4_fields()) == 7
+    assert len(expected_number.make_d4_fields()) == 36
+
+    field = expected_number.make_d4_fields()[8]
+    assert field.c == 9
+    assert field.poly == "x4+6x2+2"
+    assert field.slopes == (2, 3, Fraction(7, 2))
+    assert expected_number.make_c2_fields()[0].slopes == ()
+    assert field.deg2_subfield == "-1"
+    assert field.inertia is expected_number.Inertia.D4
+
+    # Slopes are immutable and exact: ints when integral and Fractions otherwise, never
+    # floats
+    for make_fields in (
+        expected_number.make_c2_fields,
+        expected_number.make_c4_fields,
+        expected_number.make_v4_fields,
+        expected_number.make_d4_fields,
+    ):
+        for field in make_fields():
+            assert type(field.slopes) is tuple
+            for slope in field.slopes:
+                assert type(slope) is (int if slope == int(slope) else Fraction)
+
+
+def test_compute():
+    """
+    The outcomes should match Table 2 of the paper
+    """
+    outcomes = expected_number.compute()
+    assert dict(outcomes) == {
+        (0, 0): 8,
+        (0, 2): 8,
+        (0, 3): 16,
+        (0, 4): 16,
+        (0, 5): 16,
+        (0, 6): 32,
+        (2, 0): 8,
+        (2, 2): 8,
+        (2, 4): 16,
+        (2, 5): 32,
+        (3, 0): 16,
+        (3, 2): 16,
+        (3, 4): 32,
+        (3, 5): 64,
+    }
+    assert expected_number.total_weight(outcomes) == Fraction(5, 2)
+
+
+def test_compute_returns_copies():
+    """
+    compute() is cached, but callers should not be able to change the cache
+    """
+    outcomes = expected_number.compute()
+    outcomes[(0, 0)] += 1
+    assert expected_number.compute()[(0, 0)] == 8
@@ -1,37 +1,66 @@
-from sympy.combinatorics import Permutation
-
 from d4counting import splitting_types
-from d4counting.splitting_types import GaloisGroup
+from d4counting.splitting_types import IDENTITY, GaloisGroup, Perm4
+
+
+def test_perm4():
+    """
+    Check the encoding and the multiplication convention on a few examples
+    """
+    σ = Perm4.from_cycles((0, 1, 2, 3))
+    τ = Perm4.from_cycles((0, 1), (2, 3))
+    assert IDENTITY == 0b11100100
+    assert Perm4.from_cycles() == IDENTITY
+    assert σ.images == (1, 2, 3, 0)
+    assert τ.images == (1, 0, 3, 2)
+
+    # Apply the left factor first
+    assert (σ * τ).images == (0, 3, 2, 1)
+    assert (τ * σ).images == (2, 1, 0, 3)
+    assert σ ** 4 == IDENTITY
+    assert σ ** -1 == σ ** 3
+    assert σ * σ ** -1 == IDENTITY
+    assert τ ** -1 == τ
+    assert τ * σ * τ == σ ** 3
+    assert len(splitting_types.MUL) == 24
+
+    # Products from the Cayley table agree with freshly built permutations
+    assert type(σ * τ) is Perm4
+    assert σ * τ == Perm4.from_images((0, 3, 2, 1))
 
 
 def test_get_cosets():
     """
     Try a few simple examples with cyclic groups
     """
-    σ = Permutation(0, 1, 2, 3)
+    σ = Perm4.from_cycles((0, 1, 2, 3))
     ι = σ ** 4
     trivial_group = GaloisGroup(group=[ι], latex_name=r"\{ 1 \}")
     cyclic_2 = GaloisGroup(group=[ι, σ ** 2], latex_name=r"C_2")
     cyclic_4 = GaloisGroup(group=[ι, σ, σ ** 2, σ ** 3], latex_name=r"C_4")
 
+    # Groups built from lists are frozen, so they agree with groups built from tuples
+    assert cyclic_2.group == (ι, σ ** 2)
+    assert cyclic_2 == GaloisGroup(group=(ι, σ ** 2), latex_name=r"C_2")
+    assert hash(cyclic_2) == hash(GaloisGroup(group=(ι, σ ** 2), latex_name=r"C_2"))
+
     # First try the trival group; should be each element on its own
     cosets = splitting_types.get_cosets(cyclic_4, trivial_group)
-    assert cosets == frozenset(frozenset({g}) for g in cyclic_4.group)
+    assert cosets == frozenset((g,) for g in cyclic_4)
 
     # Next try C2 ⊆ C4. Should be two sets: C2 and the rest
     cosets = splitting_types.get_cosets(cyclic_4, cyclic_2)
-    assert cosets == frozenset({frozenset(cyclic_2), frozenset({σ, σ ** 3})})
+    assert cosets == frozenset({tuple(sorted(cyclic_2)), tuple(sorted((σ, σ ** 3)))})
 
     # Finally, try the whole C4 ⊆ C$. Should be one set
     cosets = splitting_types.get_cosets(cyclic_4, cyclic_4)
-    assert cosets == frozenset({frozenset(cyclic_4)})
+    assert cosets == frozenset({tuple(sorted(cyclic_4))})
 
 
 def test_get_orbits():
     """
     Try a simple example with the cyclic group of order 4
     """
-    σ = Permutation(0, 1, 2, 3)
+    σ = Perm4.from_cycles((0, 1, 2, 3))
     ι = σ ** 4
     trivial_group = GaloisGroup(group=[ι], latex_name=r"\{ 1 \}")
     cyclic_2 = GaloisGroup(group=[ι, σ ** 2], latex_name=r"C_2")
@@ -41,10 +70,7 @@ def test_get_orbits():
     cosets = splitting_types.get_cosets(cyclic_4, trivial_group)
     orbits = splitting_types.get_orbits(cosets, cyclic_2)
     assert orbits == frozenset(
-        {
-            frozenset({frozenset({ι}), frozenset({σ ** 2})}),
-            frozenset({frozenset({σ}), frozenset({σ ** 3})}),
-        }
+        {frozenset({(ι,), (σ ** 2,)}), frozenset({(σ,), (σ ** 3,)})}
     )
 
 
@@ -52,9 +78,9 @@ def test_compute_inertia():
     """
     Run a complete example for D4 that we know the answer to
     """
-    σ = Permutation(0, 1, 2, 3)
-    τ = Permutation(0, 1)(2, 3)
-    ι = Permutation(3)  # The identity
+    σ = Perm4.from_cycles((0, 1, 2, 3))
+    τ = Perm4.from_cycles((0, 1), (2, 3))
+    ι = IDENTITY
 
     # Big Galois group
     Gal_M_Q = GaloisGroup(
@@ -88,3 +114,30 @@ def test_compute_inertia():
     orbits = splitting_types.get_orbits(cosets, Gal_M_K)
     inertia = splitting_types.compute_inertia(orbits, Gal_M_L)
     assert splitting_types.write_inertia(inertia) == "(2 2)"
+
+
+def test_write_inertia():
+    """
+    Sort by inertia degree, then by decreasing ramification, without mutating the input
+    """
+    inertia = [(2, 1), (2, 3), (1, 2), (1, 1)]
+    assert splitting_types.write_inertia(inertia) == "(1^2 1 2^3 2)"
+    assert inertia == [(2, 1), (2, 3), (1, 2), (1, 1)]
+
+
+def test_splitting_table():
+    """
+    Spot check Table 1 and make sure it is only computed once
+    """
+    table = splitting_types.splitting_table()
+    assert len(table) == 18
+    assert all(len(cells) == 7 for _, _, cells in table)
+
+    # Unramified with D_p = <σ^2>
+    assert table[1] == (
+        r"\{1\}",
+        r"\langle \sigma^2 \rangle",
+        ("(2 2 2 2)", "(2 2)", "(1 1)", "(2 2)", "(1 1)", "(1 1 1 1)", "(1 1)"),
+    )
+
+    assert splitting_types.splitting_table() is table